@@ -1,58 +1,179 @@
+import atexit
 import psutil
 import os
+import re
 import subprocess
 import shutil
+import sys
+import threading
+import time
+
+# Matches lines like "CPU Power: 1234 mW" in powermetrics output; applied
+# once per interval blob with re.M rather than scanning every line in Python
+_POWER_BLOCK_RE = re.compile(r"^(CPU|GPU|ANE) Power:\s+(\d+\.?\d*)", re.M)
+
+class PowerMetricsStreamer:
+    """Keeps one long-lived powermetrics process running and parses its output in the background.
+
+    Spawning `sudo powermetrics --duration 1` per sample pays fork/exec, sudo
+    auth and sampler warm-up cost on every call. Instead we start powermetrics
+    once with a 1-second interval and read its stdout in a daemon thread,
+    keeping only the latest CPU/GPU/ANE readings.
+    """
+
+    def __init__(self, interval_ms=1000):
+        self.proc = subprocess.Popen(
+            ["sudo", "powermetrics", "--samplers", "cpu_power,gpu_power,ane_power", "-i", str(interval_ms)],
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, bufsize=1
+        )
+        self._interval_ms = interval_ms
+        self._lock = threading.Lock()
+        self.latest = None
+        self._first_sample = threading.Event()
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+
+    def _publish(self, block):
+        """Parse one interval blob in a single regex pass and publish it."""
+        values = dict(_POWER_BLOCK_RE.findall("".join(block)))
+        if not values:
+            return
+        cpu_power = float(values.get("CPU", 0))
+        gpu_power = float(values.get("GPU", 0))
+        ane_power = float(values.get("ANE", 0))  # Absent on Intel Macs
+        with self._lock:
+            self.latest = {
+                "CPU Power (mW)": cpu_power,
+                "GPU Power (mW)": gpu_power,
+                "ANE Power (mW)": ane_power,
+                "Total Power (mW)": cpu_power + gpu_power + ane_power
+            }
+        self._first_sample.set()
+
+    def _read_loop(self):
+        """Accumulate each powermetrics interval blob and parse it when complete."""
+        block = []
+        for line in self.proc.stdout:
+            # Each interval starts with a "*** Sampled system activity ..." banner,
+            # so its arrival means the previous blob is complete
+            if line.startswith("*** Sampled"):
+                self._publish(block)
+                block = []
+            else:
+                block.append(line)
+        self._publish(block)  # powermetrics exited — flush the tail
+
+    def read(self):
+        """Return the most recent power sample, or None if nothing parsed yet.
+
+        A blob is only published when the next interval's banner arrives, so
+        the first sample lands ~2 intervals after start. Wait up to 2.5
+        intervals so one-shot callers get a real reading instead of None.
+        """
+        self._first_sample.wait(self._interval_ms * 2.5 / 1000)
+        with self._lock:
+            return dict(self.latest) if self.latest else None
+
+    def stop(self):
+        """Terminate the powermetrics process and reap it."""
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+_streamer = None
 
 def get_total_power():
     """Fetch total system-wide power usage (CPU, GPU, ANE) using powermetrics."""
+    global _streamer
     if not shutil.which("powermetrics"):
         return None
 
     try:
-        result = subprocess.run(
-            ["sudo", "powermetrics", "--samplers", "cpu_power,gpu_power,ane_power", "--duration", "1"],
-            capture_output=True, text=True
-        )
-
-        cpu_power, gpu_power, ane_power = 0, 0, 0
-        
-        for line in result.stdout.split("\n"):
-            if "CPU Power" in line:
-                cpu_power = float(line.split(':')[1].strip().split()[0])
-            elif "GPU Power" in line:
-                gpu_power = float(line.split(':')[1].strip().split()[0])
-            elif "ANE Power" in line:
-                ane_power = float(line.split(':')[1].strip().split()[0])
-
-        return {
-            "CPU Power (mW)": cpu_power,
-            "GPU Power (mW)": gpu_power,
-            "ANE Power (mW)": ane_power,
-            "Total Power (mW)": cpu_power + gpu_power + ane_power
-        }
+        if _streamer is None:
+            _streamer = PowerMetricsStreamer()
+            # The unbounded sudo child must not outlive this process
+            atexit.register(_streamer.stop)
+        return _streamer.read()
     except Exception as e:
         print("Error fetching power metrics:", e)
         return None
 
 def list_running_processes():
-    """List all running processes with their PID and status."""
-    print("\n%-10s %-30s %-15s" % ("PID", "Process Name", "Status"))
-    print("-" * 60)
-    
-    for process in psutil.process_iter(attrs=['pid', 'name', 'status']):
+    """List all running processes with their PID and status in one stdout write."""
+    rows = ["\n%-10s %-30s %-15s" % ("PID", "Process Name", "Status"), "-" * 60]
+
+    for process in psutil.process_iter(attrs=("pid", "name", "status")):
         try:
-            print("%-10s %-30s %-15s" % (process.info['pid'], process.info['name'], process.info['status']))
+            rows.append("%-10s %-30s %-15s" % (process.info['pid'], process.info['name'], process.info['status']))
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
             pass
 
+    sys.stdout.write("\n".join(rows) + "\n")
+
+# Cached RAPL state: {domain_path: (fd, max_energy_range_uj)} and previous samples
+_rapl_fds = {}
+_rapl_prev = {}
+_RAPL_DOMAINS = [
+    "/sys/class/powercap/intel-rapl:0",      # package
+    "/sys/class/powercap/intel-rapl:0:0",    # DRAM sub-domain
+]
+
+def _read_rapl_uj(domain):
+    """Read the cumulative energy counter (microjoules) for a RAPL domain."""
+    if domain not in _rapl_fds:
+        fd = os.open(os.path.join(domain, "energy_uj"), os.O_RDONLY)
+        try:
+            with open(os.path.join(domain, "max_energy_range_uj"), "r") as f:
+                max_range = int(f.read().strip())
+        except OSError:
+            max_range = 2 ** 32  # Counters are at least 32-bit
+        _rapl_fds[domain] = (fd, max_range)
+    fd, _ = _rapl_fds[domain]
+    os.lseek(fd, 0, os.SEEK_SET)
+    return int(os.read(fd, 32))
+
+def _rapl_power_watts():
+    """Compute power (Watts) from two timestamped reads of the RAPL energy counters.
+
+    The energy_uj file is a cumulative counter, not an instantaneous reading,
+    so power is the delta between successive samples divided by elapsed time.
+    Domains without a previous sample are primed and re-read after a short
+    wait, so even a one-shot call returns a real measurement.
+    """
+    domains = [domain for domain in _RAPL_DOMAINS if os.path.exists(domain)]
+    if not domains:
+        return None
+
+    # Prime any domain we have not sampled yet, then let some energy accrue
+    unprimed = [domain for domain in domains if domain not in _rapl_prev]
+    if unprimed:
+        for domain in unprimed:
+            _rapl_prev[domain] = (time.monotonic_ns(), _read_rapl_uj(domain))
+        time.sleep(0.1)
+
+    total_watts = 0.0
+    have_delta = False
+    for domain in domains:
+        uj = _read_rapl_uj(domain)
+        now = time.monotonic_ns()
+        prev_ns, prev_uj = _rapl_prev[domain]
+        _rapl_prev[domain] = (now, uj)
+        delta_uj = uj - prev_uj
+        if delta_uj < 0:  # Counter wrapped around max_energy_range_uj
+            delta_uj += _rapl_fds[domain][1]
+        elapsed_s = (now - prev_ns) / 1e9
+        if elapsed_s > 0:
+            total_watts += (delta_uj / 1e6) / elapsed_s
+            have_delta = True
+    return round(total_watts, 2) if have_delta else None
+
 def get_power_consumption():
-    """Fetch real-time power consumption using powermetrics (macOS)."""
+    """Fetch real-time power consumption using RAPL (Linux), IPMI (servers) or powermetrics (macOS)."""
     try:
         if os.path.exists("/sys/class/powercap/intel-rapl"):  # Intel RAPL check (Linux)
-            with open("/sys/class/powercap/intel-rapl:0/energy_uj", "r") as f:
-                energy_uj = int(f.read().strip())
-                power_watts = energy_uj / 1e6  # Convert microjoules to watts
-                return round(power_watts, 2)
+            return _rapl_power_watts()
         elif shutil.which("ipmitool"):  # Check if IPMI tool is available (Servers)
             result = subprocess.run(["ipmitool", "sensor"], capture_output=True, text=True)
             for line in result.stdout.split("\n"):
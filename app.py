@@ -1,13 +1,17 @@
 import os
 import csv
 import time
+import atexit
+import signal
+import functools
+import threading
 import psutil
 import platform
 import requests
-from datetime import datetime
-from uuid import uuid4
+from requests.adapters import HTTPAdapter
 import subprocess
 from prometheus_client import Gauge, start_http_server, CollectorRegistry
+from prometheus_client.core import GaugeMetricFamily
 
 # Try importing NVML for GPU monitoring (Only available for NVIDIA GPUs)
 gpu_available = False
@@ -38,11 +42,20 @@ TEXT_LABELS = [
 # ✅ Use a Registry to prevent duplicate registration
 registry = CollectorRegistry()
 
-# ✅ Create Gauges for numeric metrics
-metrics = {
-    metric: Gauge(f"sustainability_{metric}", f"Metric for {metric}", registry=registry)
-    for metric in NUMERIC_METRICS
-}
+# ✅ Latest numeric sample — the sampler loop updates this dict and scrapes
+# read a snapshot of it, so neither side takes per-metric locks
+LATEST = {}
+
+class SustainabilityCollector:
+    """Builds the numeric metrics on demand from the latest sample snapshot."""
+
+    def collect(self):
+        snapshot = LATEST.copy()
+        for metric in NUMERIC_METRICS:
+            if metric in snapshot:
+                yield GaugeMetricFamily(f"sustainability_{metric}", f"Metric for {metric}", value=snapshot[metric])
+
+registry.register(SustainabilityCollector())
 
 # ✅ Create a single Gauge for text labels (stored as metadata)
 info_metric = Gauge(
@@ -57,6 +70,7 @@ if not is_apple_silicon:
     try:
         from pynvml import (
             nvmlInit,
+            nvmlDeviceGetCount,
             nvmlDeviceGetHandleByIndex,
             nvmlDeviceGetPowerUsage,
             nvmlShutdown,
@@ -68,45 +82,102 @@ if not is_apple_silicon:
         print(f"Warning: Could not initialize NVML for GPU monitoring. Reason: {e}")
         gpu_available = False
 
+def _resolve_gpu_handles():
+    """Enumerates NVML device handles once — they stay valid across samples."""
+    return [nvmlDeviceGetHandleByIndex(i) for i in range(nvmlDeviceGetCount())]
+
+# ✅ Cached NVML handles, resolved at init instead of per sample
+_GPU_HANDLES = _resolve_gpu_handles() if gpu_available else []
+
 # Constants
 GRID_CARBON_FACTOR = 400  # gCO2e/kWh (Change as per country)
 PROJECT_NAME = "codecarbon"
 CSV_FILE = "sustainability_metrics.csv"
 
+# Prime psutil's CPU counters so later non-blocking cpu_percent(None) calls
+# return a delta since the previous sample instead of a meaningless 0.0
+psutil.cpu_percent(None)
+
+# ✅ Shared HTTP session — metadata fetches reuse one pooled TCP connection
+# instead of opening a fresh socket per requests.get
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=2, pool_maxsize=2, max_retries=0))
+
+def _read_dmi(name):
+    """Reads a DMI identifier from sysfs, returning an empty string if unavailable."""
+    try:
+        with open(f"/sys/class/dmi/id/{name}", "r") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
+
 # Function to detect cloud provider
 def get_cloud_info():
-    """Detects if running on AWS, Azure, or GCP."""
+    """Detects if running on AWS, Azure, or GCP.
+
+    DMI identifiers are checked first so the metadata endpoints are only
+    queried after a provider is positively identified — on bare metal no
+    HTTP request (and no multi-second timeout) is made at all.
+    """
     cloud_provider, cloud_region = "N", "N/A"
-    
+
     try:
-        if os.path.exists("/sys/hypervisor/uuid") and "ec2" in open("/sys/hypervisor/uuid").read():
+        product_uuid = _read_dmi("product_uuid").lower()
+        sys_vendor = _read_dmi("sys_vendor")
+
+        if product_uuid.startswith("ec2") or sys_vendor == "Amazon EC2":
             cloud_provider = "aws"
-            cloud_region = requests.get("http://169.254.169.254/latest/meta-data/placement/region", timeout=2).text
-        elif "Microsoft" in platform.uname().release:
+            cloud_region = _SESSION.get("http://169.254.169.254/latest/meta-data/placement/region", timeout=2).text
+        elif sys_vendor == "Microsoft Corporation" or "Microsoft" in platform.uname().release:
             cloud_provider = "azure"
             cloud_region = "brazilsouth"  # Azure does not expose this directly
-        elif os.path.exists("/etc/google_system"):
+        elif sys_vendor == "Google" or _read_dmi("product_name") == "Google Compute Engine":
             cloud_provider = "gcp"
-            cloud_region = requests.get(
-                "http://metadata.google.internal/computeMetadata/v1/instance/zone", 
-                headers={"Metadata-Flavor": "Google"}, 
+            cloud_region = _SESSION.get(
+                "http://metadata.google.internal/computeMetadata/v1/instance/zone",
+                headers={"Metadata-Flavor": "Google"},
                 timeout=2
             ).text.split("/")[-1]
     except Exception as e:
         print(f"Warning: Could not determine cloud provider. Reason: {e}")
-    
+
     return cloud_provider, cloud_region
 
 # Function to get location
 def get_location():
     """Fetches the approximate latitude and longitude of the machine."""
     try:
-        response = requests.get("http://ip-api.com/json/", timeout=3).json()
+        response = _SESSION.get("http://ip-api.com/json/", timeout=3).json()
         return response["country"], response["countryCode"], response["regionName"], response["lat"], response["lon"]
     except Exception as e:
         print(f"Warning: Could not fetch location data. Reason: {e}")
         return "Unknown", "N/A", "N/A", "N/A", "N/A"
 
+def get_cpu_name():
+    """Resolves the marketing CPU name without forking a subprocess."""
+    try:
+        if platform.system() == "Windows":
+            import winreg
+            key_path = r"HARDWARE\DESCRIPTION\System\CentralProcessor\0"
+            with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path) as key:
+                return winreg.QueryValueEx(key, "ProcessorNameString")[0].strip()
+        elif platform.system() == "Darwin":  # macOS
+            import ctypes
+            libc = ctypes.CDLL("libc.dylib")
+            size = ctypes.c_size_t(256)
+            buf = ctypes.create_string_buffer(size.value)
+            if libc.sysctlbyname(b"machdep.cpu.brand_string", buf, ctypes.byref(size), None, 0) == 0:
+                return buf.value.decode().strip()
+        elif platform.system() == "Linux":
+            with open("/proc/cpuinfo", "r") as f:
+                for line in f:
+                    if "model name" in line:
+                        return line.split(":")[1].strip()
+    except Exception as e:
+        print(f"Warning: Could not fetch CPU name. Reason: {e}")
+    return "Unknown"
+
+@functools.lru_cache(maxsize=1)
 def get_system_info():
     """Retrieves detailed system information including CPU, GPU, RAM, and OS details."""
     # Get CPU model and count
@@ -120,21 +191,8 @@ def get_system_info():
     # Get total RAM size in GB
     ram_total_size = round(psutil.virtual_memory().total / (1024 ** 3), 2)  # Convert bytes to GB
 
-    # Getting CPU Name
-    cpu_name = "Unknown"
-    try:
-        if platform.system() == "Windows":
-            cpu_name = subprocess.check_output("wmic cpu get Name", shell=True).decode().split("\n")[1].strip()
-        elif platform.system() == "Darwin":  # macOS
-            cpu_name = subprocess.check_output(["sysctl", "-n", "machdep.cpu.brand_string"]).decode().strip()
-        elif platform.system() == "Linux":
-            with open("/proc/cpuinfo", "r") as f:
-                for line in f.readlines():
-                    if "model name" in line:
-                        cpu_name = line.split(":")[1].strip()
-                        break
-    except Exception as e:
-        print(f"Warning: Could not fetch CPU name. Reason: {e}")
+    # Getting CPU Name (registry / sysctl FFI / procfs — no fork+exec)
+    cpu_name = get_cpu_name()
 
     # GPU info (Only if available)
     gpu_count = 0
@@ -161,128 +219,207 @@ def get_system_info():
     except Exception as e:
         print(f"Warning: Could not fetch GPU details. Reason: {e}")
 
-    # Getting RAM Name (Manufacturer)
+    # Getting RAM Name (Manufacturer) — dmidecode needs root and can hang on a
+    # sudo password prompt, so Linux falls back to the generic label instead
     ram_name = "Generic RAM"
     try:
         if platform.system() == "Windows":
             ram_name = subprocess.check_output("wmic memorychip get Manufacturer", shell=True).decode().split("\n")[1].strip()
-        elif platform.system() == "Linux":
-            ram_name = subprocess.check_output("sudo dmidecode --type 17 | grep 'Manufacturer'", shell=True).decode().split("\n")[0].split(":")[1].strip()
     except Exception as e:
         print(f"Warning: Could not fetch RAM name. Reason: {e}")
 
     return cpu_model, cpu_count, cpu_name, gpu_model, gpu_count, gpu_name, ram_total_size, ram_name, os_info, python_version
 
+# ✅ Folded conversion constants for the per-sample arithmetic kernel
+CPU_MAX_POWER = 65  # Approximate CPU package power at full utilization (Watts)
+RAM_WATTS_PER_GB = 2
+_BYTES_PER_GB = 1024 ** 3
+_KWH_PER_WATT_SECOND = 1 / 3_600_000
+_KG_CO2_PER_KWH = GRID_CARBON_FACTOR / 1000
+
+def _power_kernel(cpu_usage, gpu_power, ram_used_bytes, duration_seconds):
+    """Pure per-sample arithmetic: powers (W), energies (kWh) and emissions (kgCO2e)."""
+    cpu_power = cpu_usage * (CPU_MAX_POWER / 100)
+    ram_power = ram_used_bytes * (RAM_WATTS_PER_GB / _BYTES_PER_GB)
+
+    to_kwh = duration_seconds * _KWH_PER_WATT_SECOND
+    cpu_energy = cpu_power * to_kwh
+    gpu_energy = gpu_power * to_kwh
+    ram_energy = ram_power * to_kwh
+    energy_consumed = cpu_energy + gpu_energy + ram_energy
+
+    emissions = energy_consumed * _KG_CO2_PER_KWH
+    emissions_rate = emissions / duration_seconds if duration_seconds else 0  # kg/s
+
+    return cpu_power, gpu_power, ram_power, cpu_energy, gpu_energy, ram_energy, energy_consumed, emissions, emissions_rate
+
 # Function to calculate power consumption
-def get_power_metrics():
-    """Estimates CPU, GPU, and RAM power usage and calculates emissions."""
-    cpu_usage = psutil.cpu_percent(interval=1)
-    cpu_power = (cpu_usage / 100) * 65  # Approximate CPU max power consumption
+def get_power_metrics(duration_seconds):
+    """Estimates CPU, GPU, and RAM power usage and calculates emissions.
+
+    Uses a non-blocking cpu_percent(None) snapshot — the loop cadence itself
+    provides the sampling delta, so the loop is no longer blocked for a full
+    second per sample. Energy is integrated over the real elapsed duration.
+    """
+    cpu_usage = psutil.cpu_percent(None)
 
     gpu_power = 0
     if gpu_available:
+        global _GPU_HANDLES
         try:
-            handle = nvmlDeviceGetHandleByIndex(0)
-            gpu_power = nvmlDeviceGetPowerUsage(handle) / 1000  # Convert to Watts
+            gpu_power = sum(nvmlDeviceGetPowerUsage(handle) for handle in _GPU_HANDLES) / 1000  # Convert to Watts
         except Exception as e:
             print(f"Warning: Could not fetch GPU power usage. Reason: {e}")
             gpu_power = 0
+            try:
+                _GPU_HANDLES = _resolve_gpu_handles()  # Re-resolve if a GPU was lost/reset
+            except Exception:
+                pass
+
+    return _power_kernel(cpu_usage, gpu_power, psutil.virtual_memory().used, duration_seconds)
+
+# ✅ Ring of pending rows, flushed in batches — one write() per ~2 minutes
+# at 1 Hz instead of an open/write/close cycle per second
+CSV_FLUSH_ROWS = 128
+_csv_buffer = []
+_csv_fp = None
+_csv_writer = None
+
+def _get_csv_writer():
+    """Opens the CSV file once, writing headers only if it is empty, and keeps the handle."""
+    global _csv_fp, _csv_writer
+    if _csv_writer is None:
+        _csv_fp = open(CSV_FILE, "a", newline="", buffering=64 * 1024)
+        _csv_writer = csv.writer(_csv_fp)
+        if os.fstat(_csv_fp.fileno()).st_size == 0:
+            _csv_writer.writerow(HEADERS)  # Write headers for a new file
+    return _csv_writer
+
+def _flush_csv_buffer():
+    """Writes any buffered rows to the CSV file in a single batch."""
+    if not _csv_buffer:
+        return
+    _get_csv_writer().writerows(_csv_buffer)
+    _csv_fp.flush()
+    _csv_buffer.clear()
+
+def _close_csv():
+    """Flushes pending rows and closes the CSV file on shutdown."""
+    _flush_csv_buffer()
+    if _csv_fp is not None:
+        _csv_fp.close()
+
+atexit.register(_close_csv)
+
+def _handle_sigterm(signum, frame):
+    """Converts SIGTERM into a normal exit so the atexit flush runs."""
+    raise SystemExit(0)
+
+signal.signal(signal.SIGTERM, _handle_sigterm)
 
-    ram_power = psutil.virtual_memory().used / (1024 ** 3) * 2  # Approx 2W per GB
-
-    # Calculate energy consumption (kWh)
-    duration_hours = 1 / 3600  # 1-second interval converted to hours
-    cpu_energy = (cpu_power * duration_hours) / 1000
-    gpu_energy = (gpu_power * duration_hours) / 1000
-    ram_energy = (ram_power * duration_hours) / 1000
-    energy_consumed = cpu_energy + gpu_energy + ram_energy
+def save_to_csv(data):
+    """Buffers a metrics row and flushes to the CSV file once per batch."""
+    _csv_buffer.append(data)
+    if len(_csv_buffer) >= CSV_FLUSH_ROWS:
+        _flush_csv_buffer()
 
-    # Carbon Emissions (gCO2e)
-    emissions = energy_consumed * GRID_CARBON_FACTOR / 1000  # Convert to kgCO2e
-    emissions_rate = emissions / 1  # kg/s
+# ✅ Cached labelled child of info_metric — text labels never change during a run,
+# so the label tuple lookup (the contended path in prometheus_client) runs once.
+_info_child = None
 
-    return cpu_power, gpu_power, ram_power, cpu_energy, gpu_energy, ram_energy, energy_consumed, emissions, emissions_rate
+# ✅ Precomputed column positions, so the per-sample loop touches only the
+# numeric columns instead of testing all 30 headers for membership
+_NUMERIC_POS = [(i, header) for i, header in enumerate(HEADERS) if header in NUMERIC_METRICS]
+_TEXT_POS = [(i, header) for i, header in enumerate(HEADERS) if header in TEXT_LABELS]
 
-def save_to_csv(data):
-    """Writes sustainability metrics to a CSV file and sends data to Prometheus."""
-    csv_file = "sustainability_metrics.csv"
-    
-    # Check if the file exists, else create a new file with headers
-    if not os.path.isfile(csv_file):
-        with open(csv_file, "w", newline="") as f:
-            writer = csv.writer(f)
-            writer.writerow(HEADERS)  # Write headers for a new file
+def send_to_prometheus(data):
+    """Publishes numeric metrics and text labels for Prometheus scrapes."""
+    global _info_child
+    sample = {}
 
-    # Append data to the file
-    with open(csv_file, "a", newline="") as f:
-        writer = csv.writer(f)
-        writer.writerow(data)
+    # ✅ Collect numeric metrics into the sample snapshot
+    for i, header in _NUMERIC_POS:
+        try:
+            sample[header] = float(data[i])
+        except ValueError:
+            print(f"Warning: Skipping non-numeric value for {header}: {data[i]}")
 
-def send_to_prometheus(data):
-    """Sends numeric metrics and text labels to Prometheus."""
-    labels = {}
-    
-    for i, value in enumerate(data):
-        header = HEADERS[i]
-        
-        # ✅ Store numeric metrics
-        if header in NUMERIC_METRICS:
-            try:
-                metrics[header].set(float(value))
-            except ValueError:
-                print(f"Warning: Skipping non-numeric value for {header}: {value}")
+    # ✅ One dict update replaces 13 individual gauge.set() lock acquisitions
+    LATEST.update(sample)
 
-        # ✅ Store text fields as labels
-        elif header in TEXT_LABELS:
-            labels[header] = str(value)
+    # ✅ Register the info metric labels once; later samples skip the text columns entirely
+    if _info_child is None:
+        labels = {header: str(data[i]) for i, header in _TEXT_POS}
+        _info_child = info_metric.labels(**labels)
+        _info_child.set(1)  # A constant value (1) to register labels
 
-    # ✅ Update the info metric with labels
-    info_metric.labels(**labels).set(1)  # A constant value (1) to register labels
+# ✅ Signals the sampler thread to finish its current iteration and exit
+_stop_event = threading.Event()
 
 # Main Function
 def main():
     """
-    Main loop that collects and logs sustainability metrics every second.
-    
+    Sampler loop that collects and logs sustainability metrics every second.
+
     - Detects cloud environment and location.
     - Monitors CPU, GPU, and RAM power consumption.
     - Estimates carbon emissions.
     - Saves results to a CSV file.
+
+    Runs in its own thread so the Prometheus HTTP server never waits on a
+    sample in progress; stops when _stop_event is set.
     """
     print("Monitoring Sustainability Metrics... (Press Ctrl+C to stop)")
     
     cloud_provider, cloud_region = get_cloud_info()
     country_name, country_iso_code, region, latitude, longitude = get_location()
     cpu_model, cpu_count, cpu_name, gpu_model, gpu_count, gpu_name, ram_total_size, ram_name, os_info, python_version = get_system_info()
-    
+
+    # ✅ Everything after the power metrics is invariant for the run — build it once
+    static_tail = (
+        country_name, country_iso_code, region, "Y" if cloud_provider != "N" else "N",
+        cloud_provider, cloud_region, os_info, python_version, cpu_count, cpu_model, cpu_name,
+        gpu_count, gpu_model, gpu_name, longitude, latitude, ram_total_size, ram_name, "machine"
+    )
+    sample_counter = 0
+    last_sample = time.monotonic()
+
     try:
-        while True:
-            timestamp = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%S")
-            run_id = str(uuid4())[:8]
-            duration = 1  # In seconds
-            
-            power_metrics = get_power_metrics()
-            data = [
-                timestamp, PROJECT_NAME, run_id, duration, *power_metrics,
-                country_name, country_iso_code, region, "Y" if cloud_provider != "N" else "N",
-                cloud_provider, cloud_region, os_info, python_version, cpu_count, cpu_model, cpu_name,
-                gpu_count, gpu_model, gpu_name, longitude, latitude, ram_total_size, ram_name, "machine"
-            ]
-            
+        while not _stop_event.is_set():
+            timestamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime())
+            run_id = f"{sample_counter:08x}"
+            sample_counter += 1
+
+            # Real elapsed time since the previous sample, for energy integration
+            now = time.monotonic()
+            duration = now - last_sample
+            last_sample = now
+
+            power_metrics = get_power_metrics(duration)
+            data = (timestamp, PROJECT_NAME, run_id, round(duration, 3), *power_metrics, *static_tail)
+
             if write_to_file:
                 save_to_csv(data)
             # Send data to Prometheus
             send_to_prometheus(data)
 
             print(f"Logged sustainability metrics at {timestamp}")
-            time.sleep(1)
-    except KeyboardInterrupt:
-        print("\nMonitoring stopped. Metrics saved in", CSV_FILE)
+            _stop_event.wait(1)
     finally:
         if gpu_available:
             nvmlShutdown()
 
 if __name__ == "__main__":
-    # Start Prometheus HTTP server on port 9271
+    # Start Prometheus HTTP server on port 9271 (scrapes are served on its own threads)
     start_http_server(9271, registry=registry)
-    main()
+
+    # Run the sampler in a background thread so serving and sampling never block each other
+    sampler = threading.Thread(target=main, name="sampler")
+    sampler.start()
+    try:
+        while sampler.is_alive():
+            sampler.join(timeout=1)
+    except KeyboardInterrupt:
+        _stop_event.set()
+        sampler.join()
+        print("\nMonitoring stopped. Metrics saved in", CSV_FILE)
@@ -1,62 +1,266 @@
+import logging
+import os
 import subprocess
-import platform
+import threading
 import time
-import random
-from prometheus_client import start_http_server, Gauge, REGISTRY
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import docker
+import psutil
+import requests
+from prometheus_client import start_http_server, REGISTRY
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.parser import text_string_to_metric_families
+
+log = logging.getLogger(__name__)
+
+# Try importing the Kubernetes client (optional — kubectl is used as fallback)
+try:
+    from kubernetes import client as k8s_client, config as k8s_config
+    k8s_available = True
+except ImportError:
+    k8s_available = False
 
 # Constants for energy and carbon calculations
 CPU_WATTS_PER_CORE = 2.5  # Approximate power consumption per CPU core in Watts
 JOULES_PER_WATT_SECOND = 1  # 1 Watt = 1 Joule per second
 CARBON_INTENSITY_GRID = 0.4  # kg CO₂ per kWh (approximate global grid average)
 CONTAINER_ENERGY_FACTOR = 0.8  # Efficiency factor for containers vs. traditional workloads
+IDLE_POWER = CPU_WATTS_PER_CORE * 0.1  # 10% of per-core power when idle
+REQUESTS_PER_SECOND = float(os.environ.get("SUSTAINABILITY_RPS", 30))  # Workload request rate
+CLOUD_CARBON_INTENSITY = 0.3  # kg CO₂ per kWh for cloud data centers
+
+# Folded conversion factors: watts held for one second → grams of CO₂eq
+# (W / 1000 / 3600 gives kWh, × intensity kg/kWh, × 1000 gives grams)
+_WATT_TO_GCO2_GRID = CARBON_INTENSITY_GRID / 3600
+_WATT_TO_GCO2_CLOUD = CLOUD_CARBON_INTENSITY / 3600
+
+# Pool for running the independent collection branches concurrently per scrape
+_collector_pool = ThreadPoolExecutor(max_workers=2)
+
+class SustainabilityCollector:
+    """Collects metrics only when Prometheus actually scrapes.
+
+    The scrape interval (typically 15 s) drives the sampling cadence, so no
+    collection work happens between scrapes.
+    """
+
+    def describe(self):
+        # Empty describe() keeps registration from triggering a collection
+        return []
+
+    def collect(self):
+        if not is_docker_running():
+            return
+
+        # The Kubernetes fetch is independent I/O — run it alongside the
+        # Docker sampling so the scrape costs max() rather than sum()
+        k8s_future = _collector_pool.submit(get_kubernetes_metrics)
+
+        proc = get_docker_process()
+        if proc:
+            cpu_usage, memory_usage = get_process_resource_usage(proc)
+            if cpu_usage is not None:
+                active_power, _ = estimate_power_consumption(cpu_usage)
+                yield GaugeMetricFamily('docker_cpu_usage', 'CPU usage percentage', value=cpu_usage)
+                yield GaugeMetricFamily('docker_memory_usage', 'Memory usage percentage', value=memory_usage)
+                yield GaugeMetricFamily('docker_power_usage_watts', 'Estimated power consumption in Watts', value=active_power)
+                yield GaugeMetricFamily('docker_energy_efficiency', 'Joules per request/task', value=estimate_energy_efficiency(active_power))
+                yield GaugeMetricFamily('docker_carbon_footprint', 'CO2 emissions per container in gCO2eq', value=estimate_carbon_footprint(active_power))
+                yield GaugeMetricFamily('docker_cloud_carbon_footprint', 'Estimated cloud CO2 emissions in gCO2eq', value=cloud_carbon_footprint(active_power))
+
+        # Container counts maintained by the event watcher (or engine endpoint)
+        running_containers, avg_image_size = get_container_metrics()
+        yield GaugeMetricFamily('docker_running_containers', 'Number of running containers', value=running_containers)
+        yield GaugeMetricFamily('docker_idle_containers', 'Number of exited (idle) containers', value=identify_idle_containers())
+        yield GaugeMetricFamily('docker_avg_image_size_mb', 'Average image size in MB', value=avg_image_size)
+
+        try:
+            # Bounded wait — a stuck kubeconfig load or API server must not
+            # hold up the whole scrape (the Docker metrics are already out)
+            total_pods, total_nodes, node_utilization = k8s_future.result(timeout=K8S_REQUEST_TIMEOUT * 2)
+        except FutureTimeoutError:
+            total_pods, total_nodes, node_utilization = 0, 0, 0
+        yield GaugeMetricFamily('k8s_total_pods', 'Total Kubernetes pods', value=total_pods)
+        yield GaugeMetricFamily('k8s_total_nodes', 'Total Kubernetes nodes', value=total_nodes)
+        yield GaugeMetricFamily('k8s_node_utilization', 'Pods per node utilization efficiency', value=node_utilization)
+
+REGISTRY.register(SustainabilityCollector())
 
-# Prometheus metrics
-cpu_usage_metric = Gauge('docker_cpu_usage', 'CPU usage percentage')
-memory_usage_metric = Gauge('docker_memory_usage', 'Memory usage percentage')
-power_usage_metric = Gauge('docker_power_usage_watts', 'Estimated power consumption in Watts')
-energy_efficiency_metric = Gauge('docker_energy_efficiency', 'Joules per request/task')
-carbon_footprint_metric = Gauge('docker_carbon_footprint', 'CO2 emissions per container in gCO2eq')
-cloud_carbon_metric = Gauge('docker_cloud_carbon_footprint', 'Estimated cloud CO2 emissions in gCO2eq')
-k8s_pods_metric = Gauge('k8s_total_pods', 'Total Kubernetes pods')
-k8s_nodes_metric = Gauge('k8s_total_nodes', 'Total Kubernetes nodes')
-k8s_utilization_metric = Gauge('k8s_node_utilization', 'Pods per node utilization efficiency')
+# Shared Docker SDK client — keeps one connection to the daemon socket alive
+# instead of forking the docker CLI on every call
+_docker_client = None
+
+def get_docker_client():
+    """Return a shared Docker SDK client connected to the daemon socket."""
+    global _docker_client
+    if _docker_client is None:
+        _docker_client = docker.from_env()
+    return _docker_client
+
+# Docker Engine's native Prometheus endpoint (enabled via the daemon's
+# metrics-addr option) — the daemon already maintains these counters in
+# memory, so scraping it beats re-deriving the same numbers ourselves
+ENGINE_METRICS_URL = os.environ.get("DOCKER_METRICS_ADDR", "http://127.0.0.1:9323/metrics")
+_engine_session = requests.Session()
+_engine_available = None
+_engine_cpu_prev = None  # (monotonic_ts, process_cpu_seconds_total)
+_engine_states = {}      # Latest container counts by state (running/paused/stopped)
+
+def engine_metrics_reachable():
+    """Check once whether the Docker engine exposes its /metrics endpoint."""
+    global _engine_available
+    if _engine_available is None:
+        try:
+            _engine_available = _engine_session.get(ENGINE_METRICS_URL, timeout=1).status_code == 200
+        except Exception:
+            _engine_available = False
+        if _engine_available:
+            log.info("✅ Scraping Docker engine metrics endpoint.")
+    return _engine_available
+
+def get_engine_metrics():
+    """Scrape the engine endpoint for daemon CPU usage and container state counts."""
+    global _engine_cpu_prev
+    try:
+        resp = _engine_session.get(ENGINE_METRICS_URL, timeout=1)
+        cpu_total = None
+        for family in text_string_to_metric_families(resp.text):
+            if family.name == "process_cpu_seconds":
+                for sample in family.samples:
+                    if sample.name == "process_cpu_seconds_total":
+                        cpu_total = sample.value
+            elif family.name == "engine_daemon_container_states_containers":
+                for sample in family.samples:
+                    _engine_states[sample.labels.get("state", "")] = int(sample.value)
+
+        # The counter is cumulative CPU seconds — derive %CPU from the delta
+        cpu_percent = None
+        now = time.monotonic()
+        if cpu_total is not None:
+            if _engine_cpu_prev is not None and now > _engine_cpu_prev[0]:
+                cpu_percent = (cpu_total - _engine_cpu_prev[1]) / (now - _engine_cpu_prev[0]) * 100
+            _engine_cpu_prev = (now, cpu_total)
+        return cpu_percent
+    except Exception:
+        return None
 
 def is_docker_running():
-    """Check if Docker is running by executing 'docker info'."""
+    """Check if Docker is running by pinging the daemon over its socket."""
     try:
-        result = subprocess.run(["docker", "info"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        if result.returncode == 0:
-            print("✅ Docker is running.")
-            return True
-        else:
-            print("❌ Docker is not running.")
-            return False
-    except FileNotFoundError:
-        print("⚠️ Docker is not installed or not in PATH.")
+        get_docker_client().ping()
+        log.debug("✅ Docker is running.")
+        return True
+    except Exception:
+        log.info("❌ Docker is not running.")
         return False
 
-def get_container_metrics():
-    """Retrieve number of running containers and container image sizes."""
+# Container counts from the last full listing — refreshed by the event watcher
+# when it is running, or polled on demand otherwise
+_last_running_count = 0
+_last_exited_count = 0
+
+# The image list changes rarely, so refresh the average size on a slow cadence
+_image_size_cache = (0.0, 0)
+IMAGE_CACHE_TTL = 60  # Seconds
+
+def _refresh_container_counts():
+    """Tally running and exited containers with one listing roundtrip."""
+    global _last_running_count, _last_exited_count
     try:
-        result = subprocess.run(["docker", "ps", "-q"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        running_containers = len(result.stdout.strip().split("\n")) if result.stdout.strip() else 0
+        containers = get_docker_client().api.containers(all=True)
+        _last_running_count = sum(1 for c in containers if c.get("State") == "running")
+        _last_exited_count = sum(1 for c in containers if c.get("State") == "exited")
+    except Exception:
+        pass
+
+# Container counts only change on lifecycle events, so subscribe to the
+# daemon's event stream once instead of re-listing containers every cycle
+_events_thread = None
+
+def _watch_docker_events():
+    """Refresh container counts whenever the daemon reports a lifecycle event."""
+    while True:
+        try:
+            for event in get_docker_client().events(decode=True, filters={"type": "container"}):
+                if event.get("status") in ("create", "start", "die", "stop", "destroy", "pause", "unpause"):
+                    _refresh_container_counts()
+        except Exception:
+            time.sleep(5)  # Daemon unreachable — retry the subscription
 
-        result = subprocess.run(["docker", "images", "--format", "{{.Size}}"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        image_sizes = [float(size.split()[0]) for size in result.stdout.strip().split("\n") if size]
+def start_docker_event_watch():
+    """Start the background event watcher and take an initial count."""
+    global _events_thread
+    if _events_thread is None or not _events_thread.is_alive():
+        _refresh_container_counts()
+        _events_thread = threading.Thread(target=_watch_docker_events, name="docker-events", daemon=True)
+        _events_thread.start()
 
-        avg_image_size = sum(image_sizes) / len(image_sizes) if image_sizes else 0
+def get_container_metrics():
+    """Retrieve number of running containers and average image size (MB)."""
+    global _image_size_cache
+    try:
+        if _engine_states:
+            running_containers = _engine_states.get("running", 0)
+        else:
+            if _events_thread is None or not _events_thread.is_alive():
+                _refresh_container_counts()  # No event stream — fall back to polling
+            running_containers = _last_running_count
+
+        # The API reports sizes in bytes — no "123MB" string parsing needed
+        last_ts, avg_image_size = _image_size_cache
+        if time.monotonic() - last_ts > IMAGE_CACHE_TTL:
+            image_sizes = [image["Size"] for image in get_docker_client().api.images()]
+            avg_image_size = (sum(image_sizes) / len(image_sizes)) / (1024 ** 2) if image_sizes else 0
+            _image_size_cache = (time.monotonic(), avg_image_size)
         return running_containers, avg_image_size
     except:
         return 0, 0
 
+def _count_lines(out):
+    """Count output lines with one C-level byte scan instead of splitting into a list."""
+    if not out:
+        return 0
+    return out.count(b"\n") + (0 if out.endswith(b"\n") else 1)
+
+# Node counts change rarely, so cache them across cycles
+_node_count_cache = (0.0, 0)
+NODE_CACHE_TTL = 60  # Seconds
+
+# Bound on any single Kubernetes fetch, so a wedged API server cannot
+# stall the scrape that is waiting on these numbers
+K8S_REQUEST_TIMEOUT = 2  # Seconds
+
+_k8s_api = None
+
+def _get_k8s_api():
+    """Return a shared Kubernetes CoreV1 API client (in-cluster or kubeconfig)."""
+    global _k8s_api
+    if _k8s_api is None:
+        try:
+            k8s_config.load_incluster_config()
+        except Exception:
+            k8s_config.load_kube_config()
+        _k8s_api = k8s_client.CoreV1Api()
+    return _k8s_api
+
 def get_kubernetes_metrics():
     """Retrieve Kubernetes-related sustainability metrics."""
+    global _node_count_cache
     try:
-        result = subprocess.run(["kubectl", "get", "pods", "--all-namespaces", "--no-headers"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        total_pods = len(result.stdout.strip().split("\n")) if result.stdout.strip() else 0
+        if k8s_available:
+            api = _get_k8s_api()
+            total_pods = len(api.list_pod_for_all_namespaces(watch=False, _request_timeout=K8S_REQUEST_TIMEOUT).items)
 
-        result = subprocess.run(["kubectl", "get", "nodes", "--no-headers"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        total_nodes = len(result.stdout.strip().split("\n")) if result.stdout.strip() else 0
+            last_ts, total_nodes = _node_count_cache
+            if time.monotonic() - last_ts > NODE_CACHE_TTL:
+                total_nodes = len(api.list_node(_request_timeout=K8S_REQUEST_TIMEOUT).items)
+                _node_count_cache = (time.monotonic(), total_nodes)
+        else:
+            result = subprocess.run(["kubectl", "get", "pods", "--all-namespaces", "--no-headers"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=K8S_REQUEST_TIMEOUT)
+            total_pods = _count_lines(result.stdout)
+
+            result = subprocess.run(["kubectl", "get", "nodes", "--no-headers"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=K8S_REQUEST_TIMEOUT)
+            total_nodes = _count_lines(result.stdout)
 
         node_utilization = (total_pods / total_nodes) if total_nodes else 0
         return total_pods, total_nodes, node_utilization
@@ -65,127 +269,95 @@ def get_kubernetes_metrics():
 
 def identify_idle_containers():
     """Check for idle containers."""
-    try:
-        result = subprocess.run(["docker", "ps", "--filter", "status=exited", "-q"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        return len(result.stdout.strip().split("\n")) if result.stdout.strip() else 0
-    except:
-        return 0
+    if _engine_states:
+        return _engine_states.get("stopped", 0)
+    return _last_exited_count
 
-def get_docker_pid():
-    """Get Docker process ID (PID) based on OS."""
-    try:
-        if platform.system() == "Darwin" or platform.system() == "Linux":
-            result = subprocess.run(["pgrep", "-f", "Docker"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        elif platform.system() == "Windows":
-            result = subprocess.run(["tasklist", "/FI", "IMAGENAME eq dockerd.exe"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        else:
-            print("⚠️ Unsupported OS for PID retrieval.")
-            return None
+# Cached psutil handle to the Docker daemon process — resolved once and only
+# re-scanned if the daemon restarts, instead of pgrep/tasklist every cycle
+_docker_proc = None
+DOCKER_PROCESS_NAMES = ("dockerd", "Docker", "Docker Desktop", "com.docker.backend", "com.docker.hyperkit")
 
-        if result.returncode == 0 and result.stdout.strip():
-            pid = result.stdout.strip().split("\n")[0].split()[0]
-            print(f"🔍 Docker process ID: {pid}")
-            return pid
-        else:
-            print("❌ Could not find Docker process ID.")
-            return None
-    except FileNotFoundError:
-        print("⚠️ Required system commands are not available.")
-        return None
+def get_docker_process():
+    """Get a cached psutil handle to the Docker daemon process."""
+    global _docker_proc
+    if _docker_proc is not None and _docker_proc.is_running():
+        return _docker_proc
+
+    _docker_proc = None
+    for proc in psutil.process_iter(["name"]):
+        if proc.info["name"] in DOCKER_PROCESS_NAMES:
+            proc.cpu_percent(None)  # Prime the CPU counter for later deltas
+            _docker_proc = proc
+            log.info("🔍 Docker process ID: %s", proc.pid)
+            break
 
-def get_process_resource_usage(pid):
-    """Get CPU and Memory usage of the Docker process."""
+    if _docker_proc is None:
+        log.info("❌ Could not find Docker process ID.")
+    return _docker_proc
+
+def get_process_resource_usage(proc):
+    """Get CPU and Memory usage of the Docker daemon (engine /metrics first, psutil fallback)."""
     try:
-        if platform.system() in ["Darwin", "Linux"]:
-            result = subprocess.run(["ps", "-p", pid, "-o", "%cpu,%mem"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        elif platform.system() == "Windows":
-            result = subprocess.run(["wmic", "process", "where", f"ProcessId={pid}", "get", "PercentProcessorTime,WorkingSetSize"], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        else:
-            print("⚠️ Unsupported OS for resource usage retrieval.")
-            return None
-
-        lines = result.stdout.strip().split("\n")
-        if len(lines) > 1:
-            usage = lines[1].strip()
-            cpu_usage = float(usage.split()[0])  # Extract CPU usage percentage
-            memory_usage = float(usage.split()[1])  # Extract memory usage percentage
-
-            print(f"📊 Resource usage for PID {pid}:")
-            print(f"   🔹 CPU Usage: {cpu_usage:.2f}%")
-            print(f"   🔹 Memory Usage: {memory_usage:.2f}%")
-            return cpu_usage, memory_usage
-        else:
-            print("❌ Could not retrieve resource usage.")
-            return None, None
-    except FileNotFoundError:
-        print("⚠️ Required system commands are not available.")
+        cpu_usage = None
+        if engine_metrics_reachable():
+            cpu_usage = get_engine_metrics()  # Also refreshes the container state counts
+
+        # oneshot() coalesces the underlying /proc/<pid> reads so the CPU and
+        # memory figures come from a single stat pass
+        with proc.oneshot():
+            if cpu_usage is None:
+                cpu_usage = proc.cpu_percent(None)
+            memory_usage = proc.memory_percent()
+
+        log.debug("📊 Resource usage for PID %s:", proc.pid)
+        log.debug("   🔹 CPU Usage: %.2f%%", cpu_usage)
+        log.debug("   🔹 Memory Usage: %.2f%%", memory_usage)
+        return cpu_usage, memory_usage
+    except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+        log.info("❌ Could not retrieve resource usage.")
         return None, None
 
 def estimate_power_consumption(cpu_usage):
     """Estimate power consumption based on CPU usage."""
     active_power = (CPU_WATTS_PER_CORE * (cpu_usage / 100))  # Watts
-    idle_power = CPU_WATTS_PER_CORE * 0.1  # 10% of active power when idle
-    print(f"⚡ Estimated Power Consumption:")
-    print(f"   🔹 Active Power Usage: {active_power:.2f} W")
-    print(f"   🔹 Idle Power Usage: {idle_power:.2f} W")
-    return active_power, idle_power
+    log.debug("⚡ Estimated Power Consumption:")
+    log.debug("   🔹 Active Power Usage: %.2f W", active_power)
+    log.debug("   🔹 Idle Power Usage: %.2f W", IDLE_POWER)
+    return active_power, IDLE_POWER
 
 def estimate_energy_efficiency(active_power):
     """Estimate energy efficiency in Joules per task/request."""
     joules_per_second = active_power * JOULES_PER_WATT_SECOND  # Convert Watts to Joules
-    requests_per_second = random.uniform(5, 50)  # Approximate request rate
-    joules_per_request = joules_per_second / requests_per_second
-    print(f"⚡ Energy Efficiency:")
-    print(f"   🔹 {joules_per_request:.2f} Joules per request/task")
+    joules_per_request = joules_per_second / REQUESTS_PER_SECOND
+    log.debug("⚡ Energy Efficiency:")
+    log.debug("   🔹 %.2f Joules per request/task", joules_per_request)
     return joules_per_request
 
 def estimate_carbon_footprint(active_power):
     """Estimate CO₂ emissions based on power consumption."""
-    energy_kwh = (active_power * (1 / 1000)) * (1 / 3600)  # Convert Watts to kWh
-    co2_emissions = energy_kwh * CARBON_INTENSITY_GRID * 1000  # Convert to gCO₂eq
-    print(f"🌱 Carbon Footprint Estimation:")
-    print(f"   🔹 CO₂ Emissions per Container: {co2_emissions:.2f} gCO₂eq")
+    co2_emissions = active_power * _WATT_TO_GCO2_GRID  # gCO₂eq
+    log.debug("🌱 Carbon Footprint Estimation:")
+    log.debug("   🔹 CO₂ Emissions per Container: %.2f gCO₂eq", co2_emissions)
     return co2_emissions
 
 def cloud_carbon_footprint(active_power):
     """Estimate cloud carbon emissions for Docker running on cloud infrastructure."""
-    cloud_emissions_factor = 0.3  # kg CO₂ per kWh for cloud data centers
-    energy_kwh = (active_power * (1 / 1000)) * (1 / 3600)
-    cloud_co2_emissions = energy_kwh * cloud_emissions_factor * 1000  # Convert to gCO₂eq
-    print(f"☁️ Cloud Carbon Footprint:")
-    print(f"   🔹 Estimated Cloud CO₂ Emissions: {cloud_co2_emissions:.2f} gCO₂eq")
+    cloud_co2_emissions = active_power * _WATT_TO_GCO2_CLOUD  # gCO₂eq
+    log.debug("☁️ Cloud Carbon Footprint:")
+    log.debug("   🔹 Estimated Cloud CO₂ Emissions: %.2f gCO₂eq", cloud_co2_emissions)
     return cloud_co2_emissions
 
 if __name__ == "__main__":
-    # Start Prometheus HTTP server on port 9271
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"), format="%(message)s")
+    if is_docker_running():
+        start_docker_event_watch()
+
+    # Start Prometheus HTTP server on port 9271 — collection now happens
+    # inside the scrape, so there is no polling loop to run
     start_http_server(9271)
-    print("🚀 Prometheus metrics available at http://localhost:9271")
+    log.info("🚀 Prometheus metrics available at http://localhost:9271")
     try:
-        while True:
-            if is_docker_running():
-                pid = get_docker_pid()
-                if pid:
-                    cpu_usage, memory_usage = get_process_resource_usage(pid)
-                    if cpu_usage is not None:
-                        active_power, _ = estimate_power_consumption(cpu_usage)
-                        energy_efficiency = estimate_energy_efficiency(active_power)
-                        carbon_footprint = estimate_carbon_footprint(active_power)
-                        cloud_co2 = cloud_carbon_footprint(active_power)
-
-                        # Update Prometheus metrics
-                        cpu_usage_metric.set(cpu_usage)
-                        memory_usage_metric.set(memory_usage)
-                        power_usage_metric.set(active_power)
-                        energy_efficiency_metric.set(energy_efficiency)
-                        carbon_footprint_metric.set(carbon_footprint)
-                        cloud_carbon_metric.set(cloud_co2)
-
-                # Kubernetes Metrics
-                total_pods, total_nodes, node_utilization = get_kubernetes_metrics()
-                k8s_pods_metric.set(total_pods)
-                k8s_nodes_metric.set(total_nodes)
-                k8s_utilization_metric.set(node_utilization)
-            
-            time.sleep(5)
+        threading.Event().wait()
     except KeyboardInterrupt:
-        print("\n🛑 Monitoring stopped.")
+        log.info("\n🛑 Monitoring stopped.")